@@ -1,15 +1,37 @@
 import flet as ft
 from datetime import datetime, timedelta
+import atexit
+import html
+from functools import lru_cache
 import json
+import mmap
 import os
-from typing import List, Dict, Optional
+import queue
+import time
+from typing import List, Dict, Optional, Set
 import socket
-from threading import Thread
-from http.server import BaseHTTPRequestHandler, HTTPServer
-import webbrowser
+from threading import Lock, RLock, Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson не установлен — используем стандартный json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _loads(buf):
+        # json.loads не принимает memoryview, поэтому буфер копируется
+        return json.loads(bytes(buf))
+
+
+_DAY_NAMES = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
 
 
 class Goal:
+    __slots__ = ("name", "deadline_days", "created_at", "completed", "failed", "deadline_date")
+
     def __init__(self, name: str, deadline_days: int,
                  created_at: Optional[datetime] = None,
                  completed: bool = False,
@@ -19,18 +41,14 @@ class Goal:
         self.created_at = created_at or datetime.now()
         self.completed = completed
         self.failed = failed
+        self.deadline_date = self.created_at + timedelta(days=self.deadline_days)
 
-    @property
-    def deadline_date(self) -> datetime:
-        return self.created_at + timedelta(days=self.deadline_days)
-
-    @property
-    def days_left(self) -> int:
-        return (self.deadline_date - datetime.now()).days
+    def days_left_at(self, now: datetime) -> int:
+        return (self.deadline_date - now).days
 
-    def check_failed(self) -> bool:
+    def check_failed(self, now: Optional[datetime] = None) -> bool:
         if not self.completed and not self.failed:
-            if datetime.now() > self.deadline_date:
+            if (now or datetime.now()) > self.deadline_date:
                 self.failed = True
                 return True
         return False
@@ -43,45 +61,55 @@ class Goal:
         return {
             "name": self.name,
             "deadline_days": self.deadline_days,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_at.timestamp(),
             "completed": self.completed,
             "failed": self.failed
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Goal':
+        created_at = data["created_at"]
+        if isinstance(created_at, str):
+            # Старый формат файла: ISO-строка вместо timestamp
+            created_at = datetime.fromisoformat(created_at)
+        else:
+            created_at = datetime.fromtimestamp(created_at)
         return cls(
             name=data["name"],
             deadline_days=data["deadline_days"],
-            created_at=datetime.fromisoformat(data["created_at"]),
+            created_at=created_at,
             completed=data["completed"],
             failed=data["failed"]
         )
 
 
 class DailyTask:
+    __slots__ = ("name", "days_of_week", "completed_dates", "_days_mask", "_active_days")
+
     def __init__(self, name: str, days_of_week: List[int],
                  completed_dates: Optional[List[str]] = None):
         self.name = name
         self.days_of_week = days_of_week  # 0-6 (пн-вс)
-        self.completed_dates = completed_dates or []
+        self._days_mask = sum(1 << d for d in set(days_of_week))
+        self._active_days = ", ".join(_DAY_NAMES[i] for i in days_of_week)
+        self.completed_dates: Set[str] = set(completed_dates or ())
 
-    @property
-    def is_active_today(self) -> bool:
-        return datetime.now().weekday() in self.days_of_week
+    def is_active_at(self, now: datetime) -> bool:
+        return bool((self._days_mask >> now.weekday()) & 1)
 
-    @property
-    def is_completed_today(self) -> bool:
-        return str(datetime.now().date()) in self.completed_dates
+    def is_completed_on(self, day_str: str) -> bool:
+        return day_str in self.completed_dates
 
     def complete_today(self) -> None:
-        today_str = str(datetime.now().date())
-        if today_str not in self.completed_dates and self.is_active_today:
-            self.completed_dates.append(today_str)
+        now = datetime.now()
+        today_str = str(now.date())
+        if today_str not in self.completed_dates and self.is_active_at(now):
+            self.completed_dates.add(today_str)
 
-    def get_active_days_names(self) -> List[str]:
-        days_names = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
-        return [days_names[i] for i in self.days_of_week]
+    @property
+    def active_days(self) -> str:
+        """Активные дни через запятую, например: Пн, Ср, Пт"""
+        return self._active_days
 
     def completion_rate(self, weeks: int = 4) -> float:
         possible_days = len(self.days_of_week) * weeks
@@ -93,7 +121,7 @@ class DailyTask:
         return {
             "name": self.name,
             "days_of_week": self.days_of_week,
-            "completed_dates": self.completed_dates
+            "completed_dates": sorted(self.completed_dates)
         }
 
     @classmethod
@@ -106,83 +134,233 @@ class DailyTask:
 
 
 class DataManager:
-    DATA_FILE = "goals_data.json"
+    GOALS_FILE = "goals.json"
+    TASKS_FILE = "tasks.json"
+    LEGACY_DATA_FILE = "goals_data.json"  # старый общий файл, читается для миграции
+
+    @staticmethod
+    def _write_atomic(path: str, payload: bytes) -> None:
+        # Пишем во временный файл одним вызовом и атомарно подменяем старый
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_json(path: str, default):
+        if not os.path.exists(path):
+            return default
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return default
+            # Парсим прямо из отображённого в память файла, без промежуточного bytes
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return _loads(view)
 
     @classmethod
-    def save_data(cls, goals: List[Goal], daily_tasks: List[DailyTask]) -> None:
-        data = {
-            "goals": [goal.to_dict() for goal in goals],
-            "daily_tasks": [task.to_dict() for task in daily_tasks]
-        }
-        with open(cls.DATA_FILE, "w") as f:
-            json.dump(data, f)
+    def write_goals(cls, payload: bytes) -> None:
+        cls._write_atomic(cls.GOALS_FILE, payload)
 
     @classmethod
-    def load_data(cls) -> tuple[List[Goal], List[DailyTask]]:
-        if not os.path.exists(cls.DATA_FILE):
-            return [], []
+    def write_tasks(cls, payload: bytes) -> None:
+        cls._write_atomic(cls.TASKS_FILE, payload)
+
+    @classmethod
+    def save_goals(cls, goals: List[Goal]) -> None:
+        cls.write_goals(_dumps([goal.to_dict() for goal in goals]))
 
-        with open(cls.DATA_FILE, "r") as f:
-            data = json.load(f)
+    @classmethod
+    def save_tasks(cls, daily_tasks: List[DailyTask]) -> None:
+        cls.write_tasks(_dumps([task.to_dict() for task in daily_tasks]))
 
-        goals = [Goal.from_dict(g) for g in data.get("goals", [])]
-        tasks = [DailyTask.from_dict(t) for t in data.get("daily_tasks", [])]
+    @classmethod
+    def load_data(cls) -> tuple[List[Goal], List[DailyTask]]:
+        has_goals = os.path.exists(cls.GOALS_FILE)
+        has_tasks = os.path.exists(cls.TASKS_FILE)
+        # Каждый раздел, для которого ещё нет нового файла, берём из старого общего файла:
+        # миграция могла прерваться между записью goals.json и tasks.json
+        legacy = {}
+        if not (has_goals and has_tasks):
+            legacy = cls._read_json(cls.LEGACY_DATA_FILE, {})
+
+        goals_data = cls._read_json(cls.GOALS_FILE, []) if has_goals else legacy.get("goals", [])
+        tasks_data = cls._read_json(cls.TASKS_FILE, []) if has_tasks else legacy.get("daily_tasks", [])
+        goals = [Goal.from_dict(g) for g in goals_data]
+        tasks = [DailyTask.from_dict(t) for t in tasks_data]
+
+        # Сразу раскладываем мигрированные разделы по новым файлам
+        if legacy and not has_goals:
+            cls.save_goals(goals)
+        if legacy and not has_tasks:
+            cls.save_tasks(tasks)
 
         return goals, tasks
 
 
 class GoalManager:
+    SAVE_DELAY = 0.5  # секунд, за которые изменения объединяются в одну запись
+    MAX_RETRY_DELAY = 30  # предельная пауза между повторами неудачной записи
+
     def __init__(self):
         self.goals: List[Goal] = []
         self.daily_tasks: List[DailyTask] = []
+        # Данные читаются из потоков веб-сервера, поэтому изменения и кэши под замком
+        self._lock = RLock()
+        self._dirty: Set[str] = set()  # какие файлы ждут записи: "goals", "tasks"
+        # Запись на диск идёт в фоновом потоке; очередь на один элемент сама объединяет запросы
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._write_lock = Lock()
+        self._writer = Thread(target=self._writer_loop, daemon=True)
+        self._version = 0  # растёт при каждом изменении данных
+        self._goals_json_cache: Optional[bytes] = None
+        self._tasks_json_cache: Optional[bytes] = None
+        self._n_completed = 0
+        self._n_failed = 0
         self.load_data()
         self.check_failed_goals()
+        self._writer.start()
+        atexit.register(self._flush)
 
     def load_data(self) -> None:
-        self.goals, self.daily_tasks = DataManager.load_data()
-
-    def save_data(self) -> None:
-        DataManager.save_data(self.goals, self.daily_tasks)
-
-    def add_goal(self, name: str, deadline_days: int) -> None:
+        with self._lock:
+            self.goals, self.daily_tasks = DataManager.load_data()
+            self._version += 1
+            self._goals_json_cache = None
+            self._tasks_json_cache = None
+            self._n_completed = 0
+            self._n_failed = 0
+            for goal in self.goals:
+                if goal.completed:
+                    self._n_completed += 1
+                elif goal.failed:
+                    self._n_failed += 1
+
+    def _mark_dirty(self, kind: str = "both") -> None:
+        """Помечает данные ("goals", "tasks" или "both") изменёнными и откладывает запись на диск"""
+        with self._lock:
+            if kind in ("goals", "both"):
+                self._dirty.add("goals")
+                self._goals_json_cache = None
+            if kind in ("tasks", "both"):
+                self._dirty.add("tasks")
+                self._tasks_json_cache = None
+            self._version += 1
+        self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        try:
+            self._save_queue.put_nowait(True)
+        except queue.Full:
+            pass  # запись уже запланирована и подхватит это изменение
+
+    def _writer_loop(self) -> None:
+        delay = self.SAVE_DELAY
+        while True:
+            self._save_queue.get()
+            time.sleep(delay)  # даём накопиться изменениям
+            try:
+                self._flush()
+                delay = self.SAVE_DELAY
+            except Exception as e:
+                # Поток не должен завершаться, иначе следующие изменения уже не сохранятся
+                print(f"Ошибка сохранения данных: {e}")
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
+
+    def _flush(self) -> None:
+        """Записывает накопленные изменения, если они есть"""
+        with self._write_lock:
+            dirty: Set[str] = set()
+            try:
+                # Под замком данных только сериализуем, сама запись идёт без него
+                with self._lock:
+                    dirty, self._dirty = self._dirty, set()
+                    goals_payload = self.goals_json() if "goals" in dirty else None
+                    tasks_payload = self.tasks_json() if "tasks" in dirty else None
+                if goals_payload is not None:
+                    DataManager.write_goals(goals_payload)
+                    dirty.discard("goals")
+                if tasks_payload is not None:
+                    DataManager.write_tasks(tasks_payload)
+                    dirty.discard("tasks")
+            finally:
+                if dirty:
+                    # Не удалось записать — возвращаем в очередь изменений и планируем повтор
+                    with self._lock:
+                        self._dirty |= dirty
+                    self._schedule_write()
+
+    def goals_json(self) -> bytes:
+        with self._lock:
+            if self._goals_json_cache is None:
+                self._goals_json_cache = _dumps([g.to_dict() for g in self.goals])
+            return self._goals_json_cache
+
+    def tasks_json(self) -> bytes:
+        with self._lock:
+            if self._tasks_json_cache is None:
+                self._tasks_json_cache = _dumps([t.to_dict() for t in self.daily_tasks])
+            return self._tasks_json_cache
+
+    def add_goal(self, name: str, deadline_days: int) -> Goal:
         new_goal = Goal(name=name, deadline_days=deadline_days)
-        self.goals.append(new_goal)
-        self.save_data()
+        with self._lock:
+            self.goals.append(new_goal)
+            self._mark_dirty("goals")
+        return new_goal
 
-    def add_daily_task(self, name: str, days_of_week: List[int]) -> None:
+    def add_daily_task(self, name: str, days_of_week: List[int]) -> DailyTask:
         new_task = DailyTask(name=name, days_of_week=days_of_week)
-        self.daily_tasks.append(new_task)
-        self.save_data()
+        with self._lock:
+            self.daily_tasks.append(new_task)
+            self._mark_dirty("tasks")
+        return new_task
 
     def complete_goal(self, goal: Goal) -> None:
-        goal.complete()
-        self.save_data()
+        with self._lock:
+            was_completed = goal.completed
+            goal.complete()
+            if goal.completed and not was_completed:
+                self._n_completed += 1
+            self._mark_dirty("goals")
 
     def complete_daily_task(self, task: DailyTask) -> None:
-        task.complete_today()
-        self.save_data()
+        with self._lock:
+            task.complete_today()
+            self._mark_dirty("tasks")
 
     def delete_goal(self, goal: Goal) -> None:
-        self.goals.remove(goal)
-        self.save_data()
+        with self._lock:
+            self.goals.remove(goal)
+            if goal.completed:
+                self._n_completed -= 1
+            elif goal.failed:
+                self._n_failed -= 1
+            self._mark_dirty("goals")
 
     def delete_daily_task(self, task: DailyTask) -> None:
-        self.daily_tasks.remove(task)
-        self.save_data()
+        with self._lock:
+            self.daily_tasks.remove(task)
+            self._mark_dirty("tasks")
 
-    def check_failed_goals(self) -> bool:
+    def check_failed_goals(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now()
         updated = False
-        for goal in self.goals:
-            if goal.check_failed():
-                updated = True
-        if updated:
-            self.save_data()
+        with self._lock:
+            for goal in self.goals:
+                if goal.check_failed(now):
+                    self._n_failed += 1
+                    updated = True
+            if updated:
+                self._mark_dirty("goals")
         return updated
 
     def get_goals_stats(self) -> Dict:
-        total = len(self.goals)
-        completed = len([g for g in self.goals if g.completed])
-        failed = len([g for g in self.goals if g.failed])
+        with self._lock:
+            total = len(self.goals)
+            completed = self._n_completed
+            failed = self._n_failed
         in_progress = total - completed - failed
 
         completion_rate = (completed / total * 100) if total > 0 else 0
@@ -196,125 +374,182 @@ class GoalManager:
         }
 
 
+_PAGE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Менеджер целей</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }}
+        .goal-card, .task-card {{ 
+            border: 1px solid #ddd; 
+            padding: 15px; 
+            margin-bottom: 10px; 
+            border-radius: 5px; 
+        }}
+        button {{ 
+            background-color: #4CAF50; 
+            color: white; 
+            border: none; 
+            padding: 8px 12px; 
+            cursor: pointer; 
+            border-radius: 4px; 
+        }}
+        button:disabled {{ background-color: #cccccc; cursor: not-allowed; }}
+        h2 {{ color: #333; }}
+    </style>
+</head>
+<body>
+    <h1>Менеджер целей</h1>
+
+    <h2>Недельные цели</h2>
+    <div id="goals-container">
+        {goals_html}
+    </div>
+
+    <h2>Ежедневные задачи</h2>
+    <div id="tasks-container">
+        {tasks_html}
+    </div>
+
+    <script>
+        function completeGoal(goalName) {{
+            fetch(`/api/complete_goal?name=${{encodeURIComponent(goalName)}}`, {{ method: 'POST' }})
+                .then(response => location.reload())
+                .catch(error => console.error('Error:', error));
+        }}
+
+        function completeTask(taskName) {{
+            fetch(`/api/complete_task?name=${{encodeURIComponent(taskName)}}`, {{ method: 'POST' }})
+                .then(response => location.reload())
+                .catch(error => console.error('Error:', error));
+        }}
+
+        // Автообновление каждые 30 секунд
+        setTimeout(() => location.reload(), 30000);
+    </script>
+</body>
+</html>
+"""
+
+_GOAL_CARD_TMPL = """
+<div class="goal-card">
+    <h3>%s</h3>
+    <p>Срок: %s (%d дней осталось)</p>
+    <p>Статус: %s</p>
+    <button onclick="completeGoal(%s)" %s>
+        Отметить выполненным
+    </button>
+</div>
+"""
+
+_TASK_CARD_TMPL = """
+<div class="task-card">
+    <h3>%s</h3>
+    <p>Дни: %s</p>
+    <p>Статус: %s</p>
+    <button onclick="completeTask(%s)" %s>
+        Отметить выполненным
+    </button>
+</div>
+"""
+
+
 class WebRequestHandler(BaseHTTPRequestHandler):
+    # Буферизуем wfile: строка статуса, заголовки и тело уходят одним send()
+    wbufsize = 1 << 16
+    # Все ответы содержат Content-Length, так что соединение можно держать открытым
+    protocol_version = "HTTP/1.1"
+
+    # Последняя отрисованная страница: общая для всех запросов
+    _html_cache: Optional[bytes] = None
+    _html_cache_key: Optional[tuple] = None
+    _html_cache_expires: Optional[datetime] = None
+
     def __init__(self, manager, *args, **kwargs):
         self.manager = manager
         super().__init__(*args, **kwargs)
 
+    def send_body(self, content_type: str, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self):
         if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-
             # Генерация HTML страницы
-            html = self.generate_web_interface()
-            self.wfile.write(html.encode())
+            self.send_body('text/html; charset=utf-8', self.get_page())
 
         elif self.path == '/api/goals':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-
-            goals_data = [goal.to_dict() for goal in self.manager.goals]
-            self.wfile.write(json.dumps(goals_data).encode())
+            self.send_body('application/json', self.manager.goals_json())
 
         elif self.path == '/api/tasks':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-
-            tasks_data = [task.to_dict() for task in self.manager.daily_tasks]
-            self.wfile.write(json.dumps(tasks_data).encode())
+            self.send_body('application/json', self.manager.tasks_json())
 
         else:
             self.send_response(404)
+            self.send_header('Content-Length', '0')
             self.end_headers()
 
-    def generate_web_interface(self) -> str:
-        goals_html = "".join(
-            f"""
-            <div class="goal-card">
-                <h3>{goal.name}</h3>
-                <p>Срок: {goal.deadline_date.strftime('%d.%m.%Y')} ({goal.days_left} дней осталось)</p>
-                <p>Статус: {"✅ Выполнено" if goal.completed else "❌ Провалено" if goal.failed else "⏳ В процессе"}</p>
-                <button onclick="completeGoal('{goal.name}')" {"disabled" if goal.completed or goal.failed else ""}>
-                    Отметить выполненным
-                </button>
-            </div>
-            """ for goal in self.manager.goals
-        )
+    def get_page(self) -> bytes:
+        """Возвращает HTML страницу, перерисовывая её только при изменениях"""
+        now = datetime.now()
+        cls = WebRequestHandler
+        with self.manager._lock:
+            key = (id(self.manager), self.manager._version, str(now.date()))
+            if cls._html_cache_key != key or now >= cls._html_cache_expires:
+                cls._html_cache = self.generate_web_interface(now).encode()
+                cls._html_cache_key = key
+                cls._html_cache_expires = self.page_expires_at(now)
+            return cls._html_cache
+
+    def page_expires_at(self, now: datetime) -> datetime:
+        """Момент, когда у какой-либо цели изменится число оставшихся дней"""
+        day = timedelta(days=1)
+        expires = datetime.combine(now.date() + day, datetime.min.time())
+        for goal in self.manager.goals:
+            expires = min(expires, now + (goal.deadline_date - now) % day)
+        return expires
 
-        tasks_html = "".join(
-            f"""
-            <div class="task-card">
-                <h3>{task.name}</h3>
-                <p>Дни: {', '.join(task.get_active_days_names())}</p>
-                <p>Статус: {"✅ Сегодня выполнено" if task.is_completed_today else "⚠️ Нужно выполнить сегодня" if task.is_active_today else "➖ Неактивно сегодня"}</p>
-                <button onclick="completeTask('{task.name}')" {"disabled" if not task.is_active_today or task.is_completed_today else ""}>
-                    Отметить выполненным
-                </button>
-            </div>
-            """ for task in self.manager.daily_tasks
-        )
+    def generate_web_interface(self, now: Optional[datetime] = None) -> str:
+        now = now or datetime.now()
+        today_str = str(now.date())
 
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Менеджер целей</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                .goal-card, .task-card {{ 
-                    border: 1px solid #ddd; 
-                    padding: 15px; 
-                    margin-bottom: 10px; 
-                    border-radius: 5px; 
-                }}
-                button {{ 
-                    background-color: #4CAF50; 
-                    color: white; 
-                    border: none; 
-                    padding: 8px 12px; 
-                    cursor: pointer; 
-                    border-radius: 4px; 
-                }}
-                button:disabled {{ background-color: #cccccc; cursor: not-allowed; }}
-                h2 {{ color: #333; }}
-            </style>
-        </head>
-        <body>
-            <h1>Менеджер целей</h1>
-
-            <h2>Недельные цели</h2>
-            <div id="goals-container">
-                {goals_html}
-            </div>
-
-            <h2>Ежедневные задачи</h2>
-            <div id="tasks-container">
-                {tasks_html}
-            </div>
-
-            <script>
-                function completeGoal(goalName) {{
-                    fetch(`/api/complete_goal?name=${{encodeURIComponent(goalName)}}`, {{ method: 'POST' }})
-                        .then(response => location.reload())
-                        .catch(error => console.error('Error:', error));
-                }}
-
-                function completeTask(taskName) {{
-                    fetch(`/api/complete_task?name=${{encodeURIComponent(taskName)}}`, {{ method: 'POST' }})
-                        .then(response => location.reload())
-                        .catch(error => console.error('Error:', error));
-                }}
-
-                // Автообновление каждые 30 секунд
-                setTimeout(() => location.reload(), 30000);
-            </script>
-        </body>
-        </html>
-        """
+        goal_parts = []
+        append = goal_parts.append
+        for goal in self.manager.goals:
+            status = "✅ Выполнено" if goal.completed else "❌ Провалено" if goal.failed else "⏳ В процессе"
+            append(_GOAL_CARD_TMPL % (
+                html.escape(goal.name),
+                goal.deadline_date.strftime('%d.%m.%Y'),
+                goal.days_left_at(now),
+                status,
+                html.escape(json.dumps(goal.name)),
+                "disabled" if goal.completed or goal.failed else "",
+            ))
+
+        task_parts = []
+        append = task_parts.append
+        for task in self.manager.daily_tasks:
+            is_active = task.is_active_at(now)
+            is_completed = task.is_completed_on(today_str)
+            status = "✅ Сегодня выполнено" if is_completed else (
+                "⚠️ Нужно выполнить сегодня" if is_active else "➖ Неактивно сегодня"
+            )
+            append(_TASK_CARD_TMPL % (
+                html.escape(task.name),
+                task.active_days,
+                status,
+                html.escape(json.dumps(task.name)),
+                "disabled" if not is_active or is_completed else "",
+            ))
+
+        return _PAGE_TEMPLATE.format_map({
+            "goals_html": "".join(goal_parts),
+            "tasks_html": "".join(task_parts),
+        })
 
 
 class NetworkManager:
@@ -325,8 +560,10 @@ class NetworkManager:
         self.local_ip = self.get_local_ip()
         self.port = 8000
 
-    def get_local_ip(self) -> str:
-        """Получает локальный IP адрес компьютера"""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_local_ip() -> str:
+        """Получает локальный IP адрес компьютера (за время работы он не меняется)"""
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         try:
             # Не требуется реальное соединение
@@ -344,7 +581,7 @@ class NetworkManager:
         def handler(*args):
             return WebRequestHandler(self.manager, *args)
 
-        self.server = HTTPServer((self.local_ip, self.port), handler)
+        self.server = ThreadingHTTPServer((self.local_ip, self.port), handler)
         self.server_thread = Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
@@ -356,6 +593,7 @@ class NetworkManager:
         if self.server:
             self.server.shutdown()
             self.server_thread.join()
+        self.manager._flush()
 
 
 class GoalAppUI:
@@ -363,6 +601,9 @@ class GoalAppUI:
         self.page = page
         self.manager = manager
         self.network = NetworkManager(manager)
+        # Карточки по id объекта, чтобы обновлять только изменившиеся
+        self._goal_cards: Dict[int, ft.Card] = {}
+        self._task_cards: Dict[int, ft.Card] = {}
         self.setup_page()
         self.setup_ui()
         self.start_network_server()
@@ -378,12 +619,6 @@ class GoalAppUI:
             self.page.snack_bar = ft.SnackBar(ft.Text(f"Ошибка запуска сервера: {str(e)}"))
             self.page.snack_bar.open = True
             self.page.update()
-class GoalAppUI:
-    def __init__(self, page: ft.Page, manager: GoalManager):
-        self.page = page
-        self.manager = manager
-        self.setup_page()
-        self.setup_ui()
 
     def setup_page(self) -> None:
         self.page.title = "Менеджер целей"
@@ -497,21 +732,42 @@ class GoalAppUI:
 
     def update_weekly_goals_tab(self) -> None:
         self.goals_list.controls.clear()
+        self._goal_cards.clear()
+        now = datetime.now()
 
         for goal in self.manager.goals:
-            status_color = ft.colors.GREEN if goal.completed else (
-                ft.colors.RED if goal.failed else ft.colors.BLUE
-            )
-            status_text = "✅ Выполнено" if goal.completed else (
-                "❌ Провалено" if goal.failed else "⏳ В процессе"
-            )
-
-            goal_card = self.create_goal_card(goal, status_text, status_color)
+            status_text, status_color = self.goal_status(goal)
+            goal_card = self.create_goal_card(goal, status_text, status_color, now)
+            self._goal_cards[id(goal)] = goal_card
             self.goals_list.controls.append(goal_card)
 
         self.page.update()
 
-    def create_goal_card(self, goal: Goal, status_text: str, status_color: str) -> ft.Card:
+    @staticmethod
+    def goal_status(goal: Goal) -> tuple[str, str]:
+        status_color = ft.colors.GREEN if goal.completed else (
+            ft.colors.RED if goal.failed else ft.colors.BLUE
+        )
+        status_text = "✅ Выполнено" if goal.completed else (
+            "❌ Провалено" if goal.failed else "⏳ В процессе"
+        )
+        return status_text, status_color
+
+    def refresh_goal_card(self, goal: Goal) -> None:
+        """Обновляет статус и кнопку в уже созданной карточке цели"""
+        status, check_button = self._goal_cards[id(goal)].data
+        status.value, status.color = self.goal_status(goal)
+        check_button.disabled = goal.completed or goal.failed
+
+    def create_goal_card(self, goal: Goal, status_text: str, status_color: str,
+                         now: datetime) -> ft.Card:
+        status = ft.Text(status_text, color=status_color)
+        check_button = ft.IconButton(
+            icon=ft.icons.CHECK,
+            tooltip="Отметить выполненным",
+            on_click=lambda e, g=goal: self.complete_goal_clicked(g),
+            disabled=goal.completed or goal.failed
+        )
         return ft.Card(
             content=ft.Container(
                 content=ft.Column(
@@ -520,20 +776,15 @@ class GoalAppUI:
                             title=ft.Text(goal.name),
                             subtitle=ft.Text(
                                 f"Срок: {goal.deadline_date.strftime('%d.%m.%Y')} "
-                                f"({goal.days_left} дней осталось)"
+                                f"({goal.days_left_at(now)} дней осталось)"
                             ),
                         ),
                         ft.Row(
                             [
-                                ft.Text(status_text, color=status_color),
+                                status,
                                 ft.Row(
                                     [
-                                        ft.IconButton(
-                                            icon=ft.icons.CHECK,
-                                            tooltip="Отметить выполненным",
-                                            on_click=lambda e, g=goal: self.complete_goal_clicked(g),
-                                            disabled=goal.completed or goal.failed
-                                        ),
+                                        check_button,
                                         ft.IconButton(
                                             icon=ft.icons.DELETE,
                                             tooltip="Удалить цель",
@@ -549,24 +800,52 @@ class GoalAppUI:
                 ),
                 width=700,
                 padding=10,
-            )
+            ),
+            data=(status, check_button),
         )
 
     def update_daily_tasks_tab(self) -> None:
         self.tasks_list.controls.clear()
+        self._task_cards.clear()
+        now = datetime.now()
+        today_str = str(now.date())
 
         for task in self.manager.daily_tasks:
-            task_card = self.create_task_card(task)
+            task_card = self.create_task_card(task, now, today_str)
+            self._task_cards[id(task)] = task_card
             self.tasks_list.controls.append(task_card)
 
         self.page.update()
 
-    def create_task_card(self, task: DailyTask) -> ft.Card:
-        status_text = "✅ Сегодня выполнено" if task.is_completed_today else (
-            "⚠️ Нужно выполнить сегодня" if task.is_active_today else "➖ Неактивно сегодня"
+    @staticmethod
+    def task_status(is_active: bool, is_completed: bool) -> tuple[str, str]:
+        status_text = "✅ Сегодня выполнено" if is_completed else (
+            "⚠️ Нужно выполнить сегодня" if is_active else "➖ Неактивно сегодня"
         )
-        status_color = ft.colors.GREEN if task.is_completed_today else (
-            ft.colors.ORANGE if task.is_active_today else ft.colors.GREY
+        status_color = ft.colors.GREEN if is_completed else (
+            ft.colors.ORANGE if is_active else ft.colors.GREY
+        )
+        return status_text, status_color
+
+    def refresh_task_card(self, task: DailyTask) -> None:
+        """Обновляет статус и кнопку в уже созданной карточке задачи"""
+        now = datetime.now()
+        is_active = task.is_active_at(now)
+        is_completed = task.is_completed_on(str(now.date()))
+        status, check_button = self._task_cards[id(task)].data
+        status.value, status.color = self.task_status(is_active, is_completed)
+        check_button.disabled = not is_active or is_completed
+
+    def create_task_card(self, task: DailyTask, now: datetime, today_str: str) -> ft.Card:
+        is_active = task.is_active_at(now)
+        is_completed = task.is_completed_on(today_str)
+        status_text, status_color = self.task_status(is_active, is_completed)
+        status = ft.Text(status_text, color=status_color)
+        check_button = ft.IconButton(
+            icon=ft.icons.CHECK,
+            tooltip="Отметить выполненным сегодня",
+            on_click=lambda e, t=task: self.complete_task_clicked(t),
+            disabled=not is_active or is_completed
         )
 
         return ft.Card(
@@ -575,19 +854,14 @@ class GoalAppUI:
                     [
                         ft.ListTile(
                             title=ft.Text(task.name),
-                            subtitle=ft.Text(f"Дни: {', '.join(task.get_active_days_names())}"),
+                            subtitle=ft.Text(f"Дни: {task.active_days}"),
                         ),
                         ft.Row(
                             [
-                                ft.Text(status_text, color=status_color),
+                                status,
                                 ft.Row(
                                     [
-                                        ft.IconButton(
-                                            icon=ft.icons.CHECK,
-                                            tooltip="Отметить выполненным сегодня",
-                                            on_click=lambda e, t=task: self.complete_task_clicked(t),
-                                            disabled=not task.is_active_today or task.is_completed_today
-                                        ),
+                                        check_button,
                                         ft.IconButton(
                                             icon=ft.icons.DELETE,
                                             tooltip="Удалить задачу",
@@ -603,7 +877,8 @@ class GoalAppUI:
                 ),
                 width=700,
                 padding=10,
-            )
+            ),
+            data=(status, check_button),
         )
 
     def update_stats_tab(self) -> None:
@@ -669,10 +944,14 @@ class GoalAppUI:
             self.show_snackbar("Пожалуйста, заполните все поля!")
             return
 
-        self.manager.add_goal(name, int(deadline))
+        goal = self.manager.add_goal(name, int(deadline))
         self.new_goal_name.value = ""
         self.new_goal_deadline.value = ""
-        self.update_weekly_goals_tab()
+        status_text, status_color = self.goal_status(goal)
+        goal_card = self.create_goal_card(goal, status_text, status_color, datetime.now())
+        self._goal_cards[id(goal)] = goal_card
+        self.goals_list.controls.append(goal_card)
+        self.page.update()
         self.show_snackbar(f"Цель '{name}' добавлена!")
 
     def add_task_clicked(self, e) -> None:
@@ -683,34 +962,42 @@ class GoalAppUI:
             self.show_snackbar("Пожалуйста, заполните название и выберите дни!")
             return
 
-        self.manager.add_daily_task(name, selected_days)
+        task = self.manager.add_daily_task(name, selected_days)
         self.new_task_name.value = ""
         for cb in self.day_checkboxes:
             cb.value = False
-        self.update_daily_tasks_tab()
+        now = datetime.now()
+        task_card = self.create_task_card(task, now, str(now.date()))
+        self._task_cards[id(task)] = task_card
+        self.tasks_list.controls.append(task_card)
+        self.page.update()
         self.show_snackbar(f"Задача '{name}' добавлена!")
 
     def complete_goal_clicked(self, goal: Goal) -> None:
         self.manager.complete_goal(goal)
-        self.update_weekly_goals_tab()
+        self.refresh_goal_card(goal)
+        self.page.update()
         self.update_stats_tab()
         self.show_snackbar(f"Цель '{goal.name}' выполнена! Молодец!")
 
     def complete_task_clicked(self, task: DailyTask) -> None:
         self.manager.complete_daily_task(task)
-        self.update_daily_tasks_tab()
+        self.refresh_task_card(task)
+        self.page.update()
         self.update_stats_tab()
         self.show_snackbar(f"Задача '{task.name}' выполнена сегодня!")
 
     def delete_goal_clicked(self, goal: Goal) -> None:
         self.manager.delete_goal(goal)
-        self.update_weekly_goals_tab()
+        self.goals_list.controls.remove(self._goal_cards.pop(id(goal)))
+        self.page.update()
         self.update_stats_tab()
         self.show_snackbar(f"Цель '{goal.name}' удалена!")
 
     def delete_task_clicked(self, task: DailyTask) -> None:
         self.manager.delete_daily_task(task)
-        self.update_daily_tasks_tab()
+        self.tasks_list.controls.remove(self._task_cards.pop(id(task)))
+        self.page.update()
         self.update_stats_tab()
         self.show_snackbar(f"Задача '{task.name}' удалена!")
 